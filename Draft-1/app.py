@@ -1,13 +1,11 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from io import BytesIO
-import time
+import numpy as np
+import hashlib
 
 from lead_enricher import LeadEnricher
 from scoring_engine import ScoringEngine
-from utils import validate_csv_format, create_sample_csv, normalize_dataframe_columns
+from utils import read_lead_csv, validate_csv_format, create_sample_csv, normalize_dataframe_columns
 
 # Page configuration
 st.set_page_config(
@@ -20,11 +18,37 @@ st.set_page_config(
 # Initialize session state
 if 'processed_leads' not in st.session_state:
     st.session_state.processed_leads = None
+if 'processed_key' not in st.session_state:
+    st.session_state.processed_key = None
 if 'enricher' not in st.session_state:
     st.session_state.enricher = LeadEnricher()
 if 'scorer' not in st.session_state:
     st.session_state.scorer = ScoringEngine()
 
+def _hash_df(df):
+    """Content hash of a DataFrame, used as the cache key for pipeline stages"""
+    digest = hashlib.md5(pd.util.hash_pandas_object(df).values)
+    digest.update(str(list(df.columns)).encode())
+    return digest.hexdigest()
+
+# Pipeline results are shared across sessions; keep only the most recent ones
+@st.cache_data(show_spinner=False, max_entries=4, hash_funcs={pd.DataFrame: _hash_df})
+def _cached_enrich(_enricher, df):
+    """Enrich leads, reusing the result for an identical upload"""
+    return _enricher.enrich_leads(df)
+
+@st.cache_data(show_spinner=False, max_entries=8, hash_funcs={pd.DataFrame: _hash_df})
+def _cached_score(_scorer, enriched_df, weights):
+    """Score leads, reusing the result while the data and weights are unchanged"""
+    return _scorer.score_leads(enriched_df)
+
+# Download bytes are kept for a few recent slider positions only; the cache is
+# shared across sessions, so an unbounded one would grow with every upload
+@st.cache_data(show_spinner=False, max_entries=8)
+def _csv_bytes(_df, data_key, min_score):
+    """Serialize leads scoring at least min_score as CSV, once per data_key and filter value"""
+    return _df[_df['lead_score'] >= min_score].to_csv(index=False).encode('utf-8')
+
 def main():
     st.title("🎯 AI-Powered B2B Lead Enrichment & Scoring")
     st.markdown("Transform raw lead data into actionable insights with intelligent enrichment and scoring")
@@ -33,11 +57,18 @@ def main():
     with st.sidebar:
         st.header("⚙️ Configuration")
         
-        # Scoring weights configuration
-        st.subheader("Scoring Weights")
-        job_title_weight = st.slider("Job Title Relevance", 0.0, 1.0, 0.4, 0.1)
-        tech_stack_weight = st.slider("Tech Stack Fit", 0.0, 1.0, 0.3, 0.1)
-        buying_intent_weight = st.slider("Buying Intent", 0.0, 1.0, 0.3, 0.1)
+        # Batch slider changes into a single rerun per submit
+        with st.form("config"):
+            # Scoring weights configuration
+            st.subheader("Scoring Weights")
+            job_title_weight = st.slider("Job Title Relevance", 0.0, 1.0, 0.4, 0.1)
+            tech_stack_weight = st.slider("Tech Stack Fit", 0.0, 1.0, 0.3, 0.1)
+            buying_intent_weight = st.slider("Buying Intent", 0.0, 1.0, 0.3, 0.1)
+            
+            # Minimum score filter
+            min_score = st.slider("Minimum Score Filter", 0, 100, 0, 5)
+            
+            st.form_submit_button("Apply")
         
         # Update scoring weights
         st.session_state.scorer.update_weights({
@@ -46,9 +77,6 @@ def main():
             'buying_intent': buying_intent_weight
         })
         
-        # Minimum score filter
-        min_score = st.slider("Minimum Score Filter", 0, 100, 0, 5)
-        
         # Download sample CSV
         st.subheader("📥 Sample Data")
         if st.button("Download Sample CSV"):
@@ -75,13 +103,14 @@ def main():
         if uploaded_file is not None:
             try:
                 # Read and validate CSV
-                df = pd.read_csv(uploaded_file)
+                df = read_lead_csv(uploaded_file)
                 
-                if validate_csv_format(df):
+                is_valid, column_mapping = validate_csv_format(df)
+                if is_valid:
                     st.success(f"✅ Valid CSV uploaded with {len(df)} leads")
                     
                     # Normalize the dataframe columns
-                    normalized_df = normalize_dataframe_columns(df)
+                    normalized_df = normalize_dataframe_columns(df, column_mapping)
                     
                     # Show preview
                     st.subheader("📋 Data Preview")
@@ -118,22 +147,20 @@ def process_leads(df):
     try:
         # Step 1: Enrich leads
         status_text.text("🔄 Enriching lead data...")
-        progress_bar.progress(25)
-        enriched_df = st.session_state.enricher.enrich_leads(df)
-        time.sleep(0.5)  # Simulate processing time
+        enriched_df = _cached_enrich(st.session_state.enricher, df)
+        progress_bar.progress(50)
         
         # Step 2: Score leads
         status_text.text("🧠 Scoring leads with AI...")
-        progress_bar.progress(75)
-        scored_df = st.session_state.scorer.score_leads(enriched_df)
-        time.sleep(0.5)
+        scorer = st.session_state.scorer
+        scored_df = _cached_score(scorer, enriched_df, tuple(sorted(scorer.weights.items())))
+        progress_bar.progress(100)
         
         # Step 3: Complete
         status_text.text("✅ Processing complete!")
-        progress_bar.progress(100)
-        
         st.session_state.processed_leads = scored_df
-        time.sleep(0.5)
+        # Hash the result once here; reruns reuse the key for cached outputs
+        st.session_state.processed_key = _hash_df(scored_df)
         
         # Clear progress indicators
         progress_bar.empty()
@@ -154,29 +181,25 @@ def display_processed_leads(min_score):
     st.header("📊 Enriched & Scored Leads")
     st.markdown(f"Showing {len(filtered_df)} of {len(df)} leads (score >= {min_score})")
     
-    # Color coding for scores
-    def color_score(val):
-        if val >= 80:
-            return 'background-color: #d4edda'  # Light green
-        elif val >= 60:
-            return 'background-color: #fff3cd'  # Light yellow
-        else:
-            return 'background-color: #f8d7da'  # Light red
+    # Color coding for scores, computed for the whole column at once
+    def color_scores(scores):
+        return np.select(
+            [scores >= 80, scores >= 60],
+            ['background-color: #d4edda',  # Light green
+             'background-color: #fff3cd'],  # Light yellow
+            default='background-color: #f8d7da'  # Light red
+        )
     
     # Display dataframe with styling
-    styled_df = filtered_df.style.applymap(color_score, subset=['lead_score'])
+    styled_df = filtered_df.style.apply(color_scores, subset=['lead_score'])
     st.dataframe(styled_df, use_container_width=True)
     
     # Download processed data
-    csv_buffer = BytesIO()
-    filtered_df.to_csv(csv_buffer, index=False)
-    csv_buffer.seek(0)
-    
     col1, col2 = st.columns([1, 4])
     with col1:
         st.download_button(
             label="💾 Download CSV",
-            data=csv_buffer.getvalue(),
+            data=_csv_bytes(df, st.session_state.processed_key, min_score),
             file_name="enriched_leads.csv",
             mime="text/csv"
         )
@@ -206,39 +229,63 @@ def display_analytics():
         conversion_rate = (high_quality / total_leads * 100) if total_leads > 0 else 0
         st.metric("Quality Rate", f"{conversion_rate:.1f}%")
     
-    # Visualizations
+    # Visualizations, rebuilt only when the processed leads change
+    data_key = st.session_state.processed_key
     col1, col2 = st.columns(2)
     
     with col1:
         # Score distribution
-        fig_hist = px.histogram(
-            df, 
-            x='lead_score', 
-            nbins=20,
-            title="Lead Score Distribution",
-            labels={'lead_score': 'Lead Score', 'count': 'Number of Leads'}
-        )
-        fig_hist.update_layout(showlegend=False)
-        st.plotly_chart(fig_hist, use_container_width=True)
+        st.plotly_chart(_hist_fig(df, data_key), use_container_width=True)
     
     with col2:
         # Job title distribution
-        job_title_counts = df['job_title'].value_counts().head(10)
-        fig_bar = px.bar(
-            x=job_title_counts.values,
-            y=job_title_counts.index,
-            orientation='h',
-            title="Top Job Titles",
-            labels={'x': 'Count', 'y': 'Job Title'}
-        )
-        fig_bar.update_layout(showlegend=False)
-        st.plotly_chart(fig_bar, use_container_width=True)
+        st.plotly_chart(_top_titles_fig(df, data_key), use_container_width=True)
     
     # Score breakdown by criteria
     st.subheader("Score Breakdown Analysis")
+    st.plotly_chart(_radar_fig(df, data_key), use_container_width=True)
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _hist_fig(_df, data_key):
+    """Lead score histogram for the processed leads identified by data_key"""
+    # Plotly is imported lazily so the upload and processing path never loads it
+    import plotly.express as px
+    
+    # Bin server-side so only the 20 bar heights are sent to the browser
+    counts, edges = np.histogram(_df['lead_score'].to_numpy(), bins=20, range=(0, 100))
+    centers = (edges[:-1] + edges[1:]) / 2
+    fig_hist = px.bar(
+        x=centers,
+        y=counts,
+        title="Lead Score Distribution",
+        labels={'x': 'Lead Score', 'y': 'Number of Leads'}
+    )
+    fig_hist.update_layout(showlegend=False, bargap=0)
+    return fig_hist
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _top_titles_fig(_df, data_key):
+    """Bar chart of the ten most common job titles"""
+    import plotly.express as px
+    
+    job_title_counts = _df['job_title'].value_counts().head(10)
+    fig_bar = px.bar(
+        x=job_title_counts.values,
+        y=job_title_counts.index,
+        orientation='h',
+        title="Top Job Titles",
+        labels={'x': 'Count', 'y': 'Job Title'}
+    )
+    fig_bar.update_layout(showlegend=False)
+    return fig_bar
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _radar_fig(_df, data_key):
+    """Radar chart of the average score per criterion"""
+    import plotly.graph_objects as go
     
     criteria_cols = ['job_title_score', 'tech_stack_score', 'buying_intent_score']
-    avg_scores = df[criteria_cols].mean()
+    avg_scores = _df[criteria_cols].mean()
     
     fig_radar = go.Figure()
     fig_radar.add_trace(go.Scatterpolar(
@@ -256,7 +303,7 @@ def display_analytics():
         showlegend=False,
         title="Average Scores by Criteria"
     )
-    st.plotly_chart(fig_radar, use_container_width=True)
+    return fig_radar
 
 def display_methodology():
     """Display scoring methodology and explanations"""
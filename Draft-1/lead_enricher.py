@@ -1,12 +1,19 @@
 import pandas as pd
-import random
-from typing import Dict, List
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
 import re
+from typing import List, Tuple
+
+from utils import STRING_DTYPE, as_arrow_strings
 
 class LeadEnricher:
     """Handles lead data enrichment with simulated realistic data"""
     
     def __init__(self):
+        # Shared generator for all simulated fields
+        self.rng = np.random.default_rng()
+        
         # Job title mappings based on email domains and patterns
         self.job_titles = {
             'technical': [
@@ -51,120 +58,142 @@ class LeadEnricher:
         
         # Company size indicators
         self.company_sizes = ['Startup', 'Small', 'Medium', 'Large', 'Enterprise']
+        self.seniority_levels = ['Junior', 'Mid-level', 'Senior', 'Executive']
+        
+        # Keyword alternation patterns, checked in priority order. These stay
+        # plain strings so Arrow-backed columns can pass them to pyarrow's regex kernels
+        self._cat_patterns = {
+            'decision_maker': r'ceo|founder|president|exec',
+            'executive': r'cto|vp|head|director',
+            'technical': r'dev|engineer|tech|code',
+            'management': r'manager|lead|principal'
+        }
+        self._name_pattern = r'dr|prof|phd'
+        self._seniority_patterns = {
+            'Executive': r'ceo|cto|vp|head|director|chief',
+            'Senior': r'senior|lead|principal|staff|manager',
+            'Junior': r'junior|associate|intern'
+        }
+        
+        # Well-known large companies
+        large_domains = ['google', 'microsoft', 'apple', 'amazon', 'facebook', 'netflix']
+        self._large_domain_pattern = '|'.join(map(re.escape, large_domains))
         
     def enrich_leads(self, df: pd.DataFrame) -> pd.DataFrame:
         """Enrich lead data with additional information"""
-        enriched_data = []
-        
-        for _, row in df.iterrows():
-            enriched_lead = self._enrich_single_lead(row)
-            enriched_data.append(enriched_lead)
-        
-        return pd.DataFrame(enriched_data)
-    
-    def _enrich_single_lead(self, lead: pd.Series) -> Dict:
-        """Enrich a single lead with additional data"""
-        # Extract basic info
-        name = lead['name']
-        email = lead['email']
-        company_domain = lead['company_domain']
+        # Extract basic info; columns that are already Arrow strings are reused
+        leads = df[['name', 'email', 'company_domain']].reset_index(drop=True)
+        leads = {col: as_arrow_strings(leads[col]) for col in leads.columns}
+        n = len(df)
         
         # Determine job category based on email and name patterns
-        job_category = self._determine_job_category(email, name)
-        job_title = random.choice(self.job_titles[job_category])
+        job_category = self._determine_job_category(leads['email'], leads['name'])
+        job_title = pd.array(self._assign_job_titles(job_category), dtype=STRING_DTYPE)
         
         # Generate seniority level
-        seniority = self._determine_seniority(job_title, email)
+        seniority = self._determine_seniority(pd.Series(job_title))
         
         # Generate LinkedIn profile
-        linkedin_url = self._generate_linkedin_url(name)
+        linkedin_url = self._generate_linkedin_urls(leads['name'])
         
         # Assign tech stack
-        tech_stack = random.choice(self.tech_stacks)
+        tech_stack = self.rng.choice(self.tech_stacks, size=n)
         
         # Determine company size
-        company_size = self._determine_company_size(company_domain)
+        company_size = self._determine_company_size(leads['company_domain'])
         
         # Generate phone number
-        phone = self._generate_phone_number()
+        phone = self._generate_phone_numbers(n)
         
-        return {
-            'name': name,
-            'email': email,
-            'company_domain': company_domain,
+        # Build the frame column-wise in one go; low-cardinality labels are categoricals
+        return pd.DataFrame({
+            'name': leads['name'],
+            'email': leads['email'],
+            'company_domain': leads['company_domain'],
             'job_title': job_title,
-            'seniority_level': seniority,
-            'linkedin_url': linkedin_url,
-            'tech_stack': tech_stack,
-            'company_size': company_size,
+            'seniority_level': pd.Categorical(seniority, categories=self.seniority_levels),
+            'linkedin_url': as_arrow_strings(linkedin_url),
+            'tech_stack': pd.array(tech_stack, dtype=STRING_DTYPE),
+            'company_size': pd.Categorical(company_size, categories=self.company_sizes),
             'phone': phone,
-            'job_category': job_category
-        }
+            'job_category': pd.Categorical(job_category, categories=list(self.job_titles))
+        })
     
-    def _determine_job_category(self, email: str, name: str) -> str:
+    def _determine_job_category(self, emails: pd.Series, names: pd.Series) -> np.ndarray:
         """Determine job category based on email patterns and name"""
-        email_lower = email.lower()
-        name_lower = name.lower()
-        
-        # Executive patterns
-        if any(pattern in email_lower for pattern in ['ceo', 'founder', 'president', 'exec']):
-            return 'decision_maker'
-        
-        if any(pattern in email_lower for pattern in ['cto', 'vp', 'head', 'director']):
-            return 'executive'
+        email_lower = emails.str.lower()
+        name_lower = names.str.lower()
         
-        # Technical patterns
-        if any(pattern in email_lower for pattern in ['dev', 'engineer', 'tech', 'code']):
-            return 'technical'
-        
-        # Management patterns
-        if any(pattern in email_lower for pattern in ['manager', 'lead', 'principal']):
-            return 'management'
+        # Executive, technical and management patterns
+        rules = [(category, email_lower, pattern) for category, pattern in self._cat_patterns.items()]
         
         # Name-based inference
-        if any(title in name_lower for title in ['dr', 'prof', 'phd']):
-            return 'technical'
+        rules.append(('technical', name_lower, self._name_pattern))
         
         # Default distribution
         weights = [0.4, 0.25, 0.15, 0.1, 0.1]
         categories = ['technical', 'management', 'executive', 'decision_maker', 'other']
-        return random.choices(categories, weights=weights)[0]
+        default = self.rng.choice(categories, size=len(emails), p=weights)
+        
+        return self._first_match(rules, default)
     
-    def _determine_seniority(self, job_title: str, email: str) -> str:
+    def _assign_job_titles(self, job_category: np.ndarray) -> np.ndarray:
+        """Pick a random job title from each lead's category"""
+        job_titles = np.empty(len(job_category), dtype=object)
+        for category, titles in self.job_titles.items():
+            mask = job_category == category
+            job_titles[mask] = self.rng.choice(titles, size=mask.sum())
+        return job_titles
+    
+    def _determine_seniority(self, job_titles: pd.Series) -> np.ndarray:
         """Determine seniority level"""
-        title_lower = job_title.lower()
-        email_lower = email.lower()
-        
-        if any(word in title_lower for word in ['ceo', 'cto', 'vp', 'head', 'director', 'chief']):
-            return 'Executive'
-        elif any(word in title_lower for word in ['senior', 'lead', 'principal', 'staff', 'manager']):
-            return 'Senior'
-        elif any(word in title_lower for word in ['junior', 'associate', 'intern']):
-            return 'Junior'
-        else:
-            return random.choice(['Mid-level', 'Senior'])
+        title_lower = job_titles.str.lower()
+        
+        rules = [(level, title_lower, pattern) for level, pattern in self._seniority_patterns.items()]
+        default = self.rng.choice(['Mid-level', 'Senior'], size=len(job_titles))
+        
+        return self._first_match(rules, default)
     
-    def _generate_linkedin_url(self, name: str) -> str:
-        """Generate LinkedIn profile URL"""
-        # Clean and format name for URL
-        clean_name = re.sub(r'[^a-zA-Z\s]', '', name)
-        url_name = clean_name.lower().replace(' ', '-')
-        return f"https://linkedin.com/in/{url_name}"
+    def _first_match(self, rules: List[Tuple[str, pd.Series, str]], default: np.ndarray) -> np.ndarray:
+        """Label each row with the first rule whose pattern it matches, else its default.
+        
+        Rules are checked in priority order and each one only scans the rows
+        left unmatched by the rules before it.
+        """
+        labels = default.astype(object)
+        remaining = np.arange(len(labels))
+        for label, values, pattern in rules:
+            if not len(remaining):
+                break
+            subset = values if len(remaining) == len(values) else values.iloc[remaining]
+            hits = subset.str.contains(pattern, na=False).to_numpy(dtype=bool)
+            labels[remaining[hits]] = label
+            remaining = remaining[~hits]
+        return labels
     
-    def _determine_company_size(self, domain: str) -> str:
+    def _generate_linkedin_urls(self, names: pd.Series) -> pd.Series:
+        """Generate LinkedIn profile URLs"""
+        # Clean and format names for URL
+        clean_names = names.str.replace(r'[^a-zA-Z\s]', '', regex=True)
+        url_names = clean_names.str.lower().str.replace(' ', '-', regex=False)
+        return 'https://linkedin.com/in/' + url_names
+    
+    def _determine_company_size(self, domains: pd.Series) -> np.ndarray:
         """Determine company size based on domain patterns"""
         # Well-known large companies
-        large_domains = ['google', 'microsoft', 'apple', 'amazon', 'facebook', 'netflix']
-        if any(large_domain in domain.lower() for large_domain in large_domains):
-            return 'Enterprise'
+        is_large = domains.str.lower().str.contains(self._large_domain_pattern, na=False)
         
         # Random distribution for others
         weights = [0.2, 0.3, 0.3, 0.15, 0.05]
-        return random.choices(self.company_sizes, weights=weights)[0]
+        sizes = self.rng.choice(self.company_sizes, size=len(domains), p=weights)
+        return np.where(is_large, 'Enterprise', sizes)
     
-    def _generate_phone_number(self) -> str:
-        """Generate a formatted phone number"""
-        area_code = random.randint(200, 999)
-        exchange = random.randint(200, 999)
-        number = random.randint(1000, 9999)
-        return f"+1 ({area_code}) {exchange}-{number}"
+    def _generate_phone_numbers(self, n: int) -> pd.Series:
+        """Generate formatted phone numbers"""
+        # Format the digits in Arrow; astype to a string dtype would build a
+        # Python str per value
+        area_code = pc.cast(pa.array(self.rng.integers(200, 1000, size=n)), pa.string())
+        exchange = pc.cast(pa.array(self.rng.integers(200, 1000, size=n)), pa.string())
+        number = pc.cast(pa.array(self.rng.integers(1000, 10000, size=n)), pa.string())
+        phones = pc.binary_join_element_wise('+1 (', area_code, ') ', exchange, '-', number, '')
+        return pd.Series(pd.arrays.ArrowStringArray(phones))
@@ -1,11 +1,17 @@
 import pandas as pd
-import random
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import re
 from typing import Dict
 
 class ScoringEngine:
     """AI-powered lead scoring engine"""
     
     def __init__(self):
+        # Shared generator for simulated score components
+        self.rng = np.random.default_rng()
+        
         # Default scoring weights
         self.weights = {
             'job_title': 0.4,
@@ -22,11 +28,18 @@ class ScoringEngine:
             'other': (30, 60)
         }
         
+        # Score ranges as arrays indexed by category code; the trailing entry
+        # is the fallback range picked up by unknown categories (code -1)
+        self._cat_order = list(self.job_title_scores)
+        score_ranges = np.array(list(self.job_title_scores.values()) + [(30, 60)], dtype=float)
+        self._lows, self._highs = score_ranges[:, 0], score_ranges[:, 1]
+        
         # Tech stack relevance keywords
         self.high_value_tech = [
             'react', 'node.js', 'python', 'kubernetes', 'docker',
             'aws', 'azure', 'microservices', 'api', 'cloud'
         ]
+        self._tech_pattern = '|'.join(map(re.escape, self.high_value_tech))
         
         # Company size multipliers
         self.size_multipliers = {
@@ -46,154 +59,158 @@ class ScoringEngine:
     
     def score_leads(self, df: pd.DataFrame) -> pd.DataFrame:
         """Score all leads in the dataframe"""
-        scored_data = []
-        
-        for _, lead in df.iterrows():
-            scored_lead = self._score_single_lead(lead)
-            scored_data.append(scored_lead)
-        
-        return pd.DataFrame(scored_data)
-    
-    def _score_single_lead(self, lead: pd.Series) -> Dict:
-        """Score a single lead"""
         # Calculate individual scores
-        job_title_score = self._score_job_title(lead['job_category'], lead['seniority_level'])
-        tech_stack_score = self._score_tech_stack(lead['tech_stack'])
-        buying_intent_score = self._score_buying_intent(lead)
+        job_title_score = self._score_job_title(df['job_category'], df['seniority_level'])
+        tech_stack_score = self._score_tech_stack(df['tech_stack'])
+        buying_intent_score = self._score_buying_intent(df)
         
         # Apply company size multiplier
-        size_multiplier = self.size_multipliers.get(lead['company_size'], 1.0)
+        size_multiplier = self._lookup(df['company_size'], self.size_multipliers, 1.0)
         
         # Calculate weighted final score
-        final_score = (
-            job_title_score * self.weights['job_title'] +
-            tech_stack_score * self.weights['tech_stack'] +
-            buying_intent_score * self.weights['buying_intent']
-        ) * size_multiplier
-        
-        # Ensure score is within bounds
-        final_score = max(0, min(100, final_score))
-        
-        # Create scored lead dictionary
-        scored_lead = lead.to_dict()
-        scored_lead.update({
-            'job_title_score': round(job_title_score, 1),
-            'tech_stack_score': round(tech_stack_score, 1),
-            'buying_intent_score': round(buying_intent_score, 1),
-            'lead_score': round(final_score, 1),
-            'score_explanation': self._generate_explanation(
+        final_score = self._combine_scores(
+            job_title_score, tech_stack_score, buying_intent_score, size_multiplier
+        )
+        
+        # Append all score columns in a single step
+        return df.assign(
+            job_title_score=np.round(job_title_score, 1),
+            tech_stack_score=np.round(tech_stack_score, 1),
+            buying_intent_score=np.round(buying_intent_score, 1),
+            lead_score=np.round(final_score, 1),
+            score_explanation=self._generate_explanation(
                 job_title_score, tech_stack_score, buying_intent_score, final_score
             )
-        })
+        )
+    
+    def _combine_scores(self, job_score: np.ndarray, tech_score: np.ndarray,
+                        intent_score: np.ndarray, size_multiplier: np.ndarray) -> np.ndarray:
+        """Weighted sum of the criteria scores, scaled by company size and clamped to 0-100"""
+        # Accumulate into one buffer instead of allocating a temporary per operator
+        final_score = job_score * self.weights['job_title']
+        final_score += tech_score * self.weights['tech_stack']
+        final_score += intent_score * self.weights['buying_intent']
+        final_score *= size_multiplier
         
-        return scored_lead
+        # Ensure score is within bounds
+        return np.clip(final_score, 0, 100, out=final_score)
+    
+    @staticmethod
+    def _lookup(labels: pd.Series, table: Dict[str, float], default: float) -> np.ndarray:
+        """Map labels through table as floats, using default for unknown labels"""
+        if isinstance(labels.dtype, pd.CategoricalDtype):
+            # Gather on the category codes; code -1 (missing) hits the trailing default
+            values = [table.get(c, default) for c in labels.cat.categories] + [default]
+            return np.array(values, dtype=float)[labels.cat.codes.to_numpy()]
+        return labels.map(table).fillna(default).to_numpy(dtype=float)
     
-    def _score_job_title(self, job_category: str, seniority: str) -> float:
+    def _score_job_title(self, job_category: pd.Series, seniority: pd.Series) -> np.ndarray:
         """Score based on job title relevance"""
-        base_range = self.job_title_scores.get(job_category, (30, 60))
-        base_score = random.uniform(base_range[0], base_range[1])
+        codes = pd.Categorical(job_category, categories=self._cat_order).codes
+        base_score = self.rng.uniform(self._lows[codes], self._highs[codes])
         
         # Seniority bonus
-        seniority_bonus = {
+        seniority_bonus = self._lookup(seniority, {
             'Executive': 10,
             'Senior': 5,
             'Mid-level': 0,
             'Junior': -10
-        }.get(seniority, 0)
+        }, 0)
         
-        return max(0, min(100, base_score + seniority_bonus))
+        return (base_score + seniority_bonus).clip(0, 100)
     
-    def _score_tech_stack(self, tech_stack: str) -> float:
+    def _score_tech_stack(self, tech_stack: pd.Series) -> np.ndarray:
         """Score based on technology stack alignment"""
-        tech_lower = tech_stack.lower()
+        tech_lower = tech_stack.str.lower()
         
         # Count high-value technologies
-        tech_matches = sum(1 for tech in self.high_value_tech if tech in tech_lower)
+        tech_matches = tech_lower.str.count(self._tech_pattern)
         
         # Base score calculation
-        if tech_matches >= 3:
-            base_score = random.uniform(85, 100)
-        elif tech_matches >= 2:
-            base_score = random.uniform(70, 90)
-        elif tech_matches >= 1:
-            base_score = random.uniform(55, 75)
-        else:
-            base_score = random.uniform(30, 60)
-        
-        return base_score
+        conditions = [tech_matches >= 3, tech_matches >= 2, tech_matches >= 1]
+        low = np.select(conditions, [85, 70, 55], default=30)
+        high = np.select(conditions, [100, 90, 75], default=60)
+        
+        return self.rng.uniform(low, high)
     
-    def _score_buying_intent(self, lead: pd.Series) -> float:
+    def _score_buying_intent(self, df: pd.DataFrame) -> np.ndarray:
         """Score based on buying intent signals"""
         # Simulate buying intent based on various factors
-        intent_factors = []
+        n = len(df)
         
         # Job category influence
-        if lead['job_category'] in ['decision_maker', 'executive']:
-            intent_factors.append(20)
-        elif lead['job_category'] == 'management':
-            intent_factors.append(10)
-        else:
-            intent_factors.append(0)
+        job_bonus = np.select(
+            [df['job_category'].isin(['decision_maker', 'executive']), df['job_category'] == 'management'],
+            [20, 10],
+            default=0
+        )
         
         # Company size influence
-        size_bonus = {
+        size_bonus = self._lookup(df['company_size'], {
             'Enterprise': 15,
             'Large': 10,
             'Medium': 5,
             'Small': 0,
             'Startup': 10  # Startups often have high buying intent
-        }.get(lead['company_size'], 0)
-        intent_factors.append(size_bonus)
+        }, 0)
         
         # Seniority influence
-        seniority_bonus = {
+        seniority_bonus = self._lookup(df['seniority_level'], {
             'Executive': 15,
             'Senior': 10,
             'Mid-level': 5,
             'Junior': 0
-        }.get(lead['seniority_level'], 0)
-        intent_factors.append(seniority_bonus)
+        }, 0)
         
         # Random market factors (simulating external signals)
-        market_factor = random.uniform(0, 25)
-        intent_factors.append(market_factor)
+        market_factor = self.rng.uniform(0, 25, size=n)
         
         # Calculate total intent score
-        total_intent = sum(intent_factors)
+        total_intent = job_bonus + size_bonus + seniority_bonus + market_factor
         
         # Add some randomness and normalize
-        final_intent = total_intent + random.uniform(-10, 10)
-        return max(0, min(100, final_intent))
+        final_intent = total_intent + self.rng.uniform(-10, 10, size=n)
+        return final_intent.clip(0, 100)
     
-    def _generate_explanation(self, job_score: float, tech_score: float, 
-                            intent_score: float, final_score: float) -> str:
-        """Generate human-readable scoring explanation"""
-        explanations = []
-        
+    @staticmethod
+    def _select_labels(conditions, labels, default: str) -> pa.Array:
+        """Arrow string array holding each row's label for its first true condition"""
+        # Pick label indices in NumPy and gather from the short label list in Arrow,
+        # so no fixed-width NumPy string array is built per row
+        index = np.select(conditions, list(range(len(labels))), default=len(labels))
+        return pa.array(labels + [default]).take(pa.array(index))
+    
+    def _generate_explanation(self, job_score: np.ndarray, tech_score: np.ndarray,
+                            intent_score: np.ndarray, final_score: np.ndarray) -> pd.arrays.ArrowStringArray:
+        """Generate human-readable scoring explanations"""
         # Job title explanation
-        if job_score >= 85:
-            explanations.append("High-value decision maker")
-        elif job_score >= 70:
-            explanations.append("Technical leader/manager")
-        elif job_score >= 50:
-            explanations.append("Technical professional")
-        else:
-            explanations.append("Lower relevance role")
+        job_text = self._select_labels(
+            [job_score >= 85, job_score >= 70, job_score >= 50],
+            ["High-value decision maker", "Technical leader/manager", "Technical professional"],
+            default="Lower relevance role"
+        )
         
         # Tech stack explanation
-        if tech_score >= 80:
-            explanations.append("excellent tech fit")
-        elif tech_score >= 60:
-            explanations.append("good tech alignment")
-        else:
-            explanations.append("limited tech relevance")
+        tech_text = self._select_labels(
+            [tech_score >= 80, tech_score >= 60],
+            ["excellent tech fit", "good tech alignment"],
+            default="limited tech relevance"
+        )
         
         # Buying intent explanation
-        if intent_score >= 75:
-            explanations.append("strong buying signals")
-        elif intent_score >= 50:
-            explanations.append("moderate buying intent")
-        else:
-            explanations.append("weak buying signals")
-        
-        return f"{', '.join(explanations)} (Score: {final_score})"
+        intent_text = self._select_labels(
+            [intent_score >= 75, intent_score >= 50],
+            ["strong buying signals", "moderate buying intent"],
+            default="weak buying signals"
+        )
+        
+        # Arrow prints integral floats without the trailing '.0' that str() gives
+        score = pa.array(final_score)
+        score_text = pc.cast(score, pa.string())
+        score_text = pc.if_else(pc.equal(score, pc.floor(score)),
+                                pc.binary_join_element_wise(score_text, '.0', ''), score_text)
+        
+        explanation = pc.binary_join_element_wise(
+            job_text, ', ', tech_text, ', ', intent_text, ' (Score: ', score_text, ')', ''
+        )
+        return pd.arrays.ArrowStringArray(explanation)